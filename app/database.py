@@ -1,19 +1,62 @@
-from sqlalchemy import create_engine
+from fastapi import Request
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
 import os
 
 SQLALCHEMY_DATABASE_URL = os.environ["PGURL"]
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def asyncpg_url(url):
+    """Turn a libpq style postgres URL into an asyncpg URL plus the
+    connect_args for the options asyncpg.connect() names differently.
+    Hosted Postgres URLs often carry ?sslmode=require, which asyncpg takes as
+    `ssl`; it negotiates channel binding on its own."""
+    url = make_url(url).set(drivername="postgresql+asyncpg")
+    connect_args = {}
+    if "sslmode" in url.query:
+        connect_args["ssl"] = url.query["sslmode"]
+    return url.difference_update_query(["sslmode", "channel_binding"]), connect_args
+
+
+ASYNC_SQLALCHEMY_DATABASE_URL, ASYNC_CONNECT_ARGS = asyncpg_url(
+    SQLALCHEMY_DATABASE_URL
+)
+
+async_engine = create_async_engine(
+    ASYNC_SQLALCHEMY_DATABASE_URL,
+    connect_args=ASYNC_CONNECT_ARGS,
+    pool_size=20,
+    max_overflow=10,
+    pool_recycle=3600,
+    pool_pre_ping=True,
+)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
 
 Base = declarative_base()
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
\ No newline at end of file
+class DBSessionMiddleware:
+    """Opens the request's session on request.state and closes it once the
+    response has been sent. The session only checks out a connection on first
+    use."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        async_db = AsyncSessionLocal()
+        scope["state"] = {**scope.get("state", {}), "async_db": async_db}
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            await async_db.close()
+
+
+def get_async_db(request: Request):
+    return request.state.async_db
@@ -1,13 +1,18 @@
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
-from fastapi.responses import PlainTextResponse
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 
 load_dotenv()
 
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from . import models
-from .database import engine, get_db
+from .migrations import run_migrations
+from .database import DBSessionMiddleware, async_engine
+from .utils.cache import close_cache, init_cache
+from .utils.compression import TextGZipMiddleware
 from .utils.rate_limit import limiter
+from .utils.static import ImmutableStaticFiles
 from app.routers import email, price, report, report_image, press_release, auth, category
 
 
@@ -15,13 +20,21 @@ from slowapi.errors import RateLimitExceeded
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 
-from fastapi.staticfiles import StaticFiles
 
-models.Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    async with async_engine.begin() as connection:
+        await connection.run_sync(models.Base.metadata.create_all)
+        await connection.run_sync(run_migrations)
+    await init_cache()
+    yield
+    await close_cache()
+    await async_engine.dispose()
 
-app = FastAPI()
 
-app.mount("/images", StaticFiles(directory="images"), name="images")
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+
+app.mount("/images", ImmutableStaticFiles(directory="images"), name="images")
 
 origins = [
     "https://localhost:3000",
@@ -38,6 +51,12 @@ origins = [
     "https://www.researchenvision.com",
 ]
 
+app.add_middleware(DBSessionMiddleware)
+
+# Report and press release lists are mostly English text and compress well;
+# small responses aren't worth the CPU.
+app.add_middleware(TextGZipMiddleware, minimum_size=1024, compresslevel=5)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -0,0 +1,125 @@
+from sqlalchemy import text
+
+# Schema changes for databases created before the matching model change.
+# They run on every startup after create_all, so each one has to be a no-op
+# once it has been applied (or when create_all already built the new schema).
+MIGRATIONS = [
+    # press_release.created_date was stored as text and cast on every sort.
+    """
+    DO $$
+    BEGIN
+        IF (
+            SELECT data_type FROM information_schema.columns
+            WHERE table_name = 'press_release' AND column_name = 'created_date'
+        ) <> 'timestamp with time zone' THEN
+            -- Legacy dates are calendar days; read them as UTC midnight,
+            -- which is how new rows are written, not in the session TimeZone.
+            ALTER TABLE press_release
+                ALTER COLUMN created_date TYPE timestamptz
+                USING NULLIF(created_date, '')::timestamp AT TIME ZONE 'UTC';
+        END IF;
+    END $$
+    """,
+    "DROP INDEX IF EXISTS ix_pr_created_date_desc",
+    # Rows whose legacy date was '' have no created_date and are listed last.
+    "DROP INDEX IF EXISTS ix_pr_created_date_id_desc",
+    "CREATE INDEX IF NOT EXISTS ix_pr_created_sort"
+    " ON press_release ((coalesce(created_date, '-infinity'::timestamptz)) DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS ix_pr_category_created"
+    " ON press_release (category_id, created_date DESC)",
+    # press_release.url was never unique before. Duplicates would make the
+    # index fail and stop the app from starting, so leave it out until they
+    # are cleaned up by hand.
+    """
+    DO $$
+    BEGIN
+        IF to_regclass('press_release_url_key') IS NOT NULL THEN
+            RETURN;
+        END IF;
+        IF EXISTS (
+            SELECT 1 FROM press_release GROUP BY url HAVING count(*) > 1
+        ) THEN
+            RAISE WARNING 'press_release has duplicate urls; press_release_url_key not created';
+        ELSE
+            CREATE UNIQUE INDEX press_release_url_key ON press_release (url);
+        END IF;
+    END $$
+    """,
+    # Full-text search on press_release.title.
+    "ALTER TABLE press_release ADD COLUMN IF NOT EXISTS tsv tsvector"
+    " GENERATED ALWAYS AS (to_tsvector('english', coalesce(title, ''))) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_pr_tsv ON press_release USING GIN (tsv)",
+    # press_release.updated_at versions the ETag of /press_release/url/{url}.
+    "ALTER TABLE press_release ADD COLUMN IF NOT EXISTS updated_at timestamptz"
+    " NOT NULL DEFAULT now()",
+    # report.created_date was stored as text and cast on every sort, too.
+    """
+    DO $$
+    BEGIN
+        IF (
+            SELECT data_type FROM information_schema.columns
+            WHERE table_name = 'report' AND column_name = 'created_date'
+        ) <> 'timestamp with time zone' THEN
+            -- Legacy dates are calendar days; read them as UTC midnight,
+            -- which is how new rows are written, not in the session TimeZone.
+            ALTER TABLE report
+                ALTER COLUMN created_date TYPE timestamptz
+                USING NULLIF(created_date, '')::timestamp AT TIME ZONE 'UTC';
+        END IF;
+    END $$
+    """,
+    # Rows whose legacy date was '' have no created_date and are listed last.
+    "DROP INDEX IF EXISTS report_created_id_idx",
+    "CREATE INDEX IF NOT EXISTS report_created_sort_idx"
+    " ON report ((coalesce(created_date, '-infinity'::timestamptz)) DESC, id DESC)",
+    # Full-text search on report.title, plus a trigram index so the
+    # title ILIKE '%keyword%' fallback can use an index too.
+    "ALTER TABLE report ADD COLUMN IF NOT EXISTS title_tsv tsvector"
+    " GENERATED ALWAYS AS (to_tsvector('english', title)) STORED",
+    "CREATE INDEX IF NOT EXISTS report_title_tsv_gin ON report USING GIN (title_tsv)",
+    """
+    DO $$
+    BEGIN
+        IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+            CREATE EXTENSION IF NOT EXISTS pg_trgm;
+            CREATE INDEX IF NOT EXISTS report_title_trgm
+                ON report USING GIN (title gin_trgm_ops);
+        END IF;
+    END $$
+    """,
+    # report_image rows were tied to their report only by an "RP<id>" in
+    # img_name, looked up with a leading-wildcard LIKE.
+    "ALTER TABLE report_image ADD COLUMN IF NOT EXISTS report_id integer"
+    " REFERENCES report (id) ON DELETE SET NULL",
+    "CREATE INDEX IF NOT EXISTS ix_report_image_report_id"
+    " ON report_image (report_id)",
+    """
+    UPDATE report_image
+    SET report_id = substring(img_name FROM 'RP(\\d+)')::integer
+    WHERE report_id IS NULL
+        AND EXISTS (
+            SELECT 1 FROM report
+            WHERE report.id = substring(img_name FROM 'RP(\\d+)')::integer
+        )
+    """,
+    # The image search endpoint still matches img_name anywhere.
+    """
+    DO $$
+    BEGIN
+        IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+            CREATE EXTENSION IF NOT EXISTS pg_trgm;
+            CREATE INDEX IF NOT EXISTS report_image_img_name_trgm
+                ON report_image USING GIN (img_name gin_trgm_ops);
+        END IF;
+    END $$
+    """,
+]
+
+MIGRATION_LOCK_ID = 72431
+
+
+def run_migrations(connection):
+    # Serialize concurrent startups of several replicas.
+    connection.execute(text(f"SELECT pg_advisory_xact_lock({MIGRATION_LOCK_ID})"))
+    for statement in MIGRATIONS:
+        connection.execute(text(statement))
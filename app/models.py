@@ -1,5 +1,17 @@
 from .database import Base
-from sqlalchemy import Column, Integer, String, DateTime, func
+from sqlalchemy import (
+    Column,
+    Computed,
+    Integer,
+    String,
+    DateTime,
+    ForeignKey,
+    Index,
+    func,
+    literal_column,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 
 
 class Report(Base):
@@ -19,8 +31,32 @@ class Report(Base):
     meta_keyword = Column(String)
     pages = Column(String)
     cover_img = Column(String)
-    created_date = Column(String)
-    
+    created_date = Column(DateTime(timezone=True))
+    title_tsv = deferred(
+        Column(TSVECTOR, Computed("to_tsvector('english', title)", persisted=True))
+    )
+
+    # The pg_trgm index on title is created in app/migrations.py, which can
+    # check that the extension is available first.
+    __table_args__ = (
+        # created_date DESC NULLS LAST, id DESC; see app/utils/pagination.py.
+        Index(
+            "report_created_sort_idx",
+            func.coalesce(created_date, literal_column("'-infinity'::timestamptz")).desc(),
+            id.desc(),
+        ),
+        Index("report_title_tsv_gin", "title_tsv", postgresql_using="gin"),
+    )
+    # Don't fetch the generated title_tsv column back after INSERT/UPDATE.
+    __mapper_args__ = {"eager_defaults": False}
+
+    # There is no FK constraint on category_id in the database.
+    category = relationship(
+        "Category",
+        primaryjoin="foreign(Report.category_id) == Category.id",
+        viewonly=True,
+    )
+
 
 class Category(Base):
     __tablename__ = "category"
@@ -42,13 +78,17 @@ class ReportImage(Base):
     id = Column(Integer, primary_key=True, nullable=False)
     img_name = Column(String, nullable=False)
     img_file = Column(String, nullable=False)
+    # Images outlive their report, as they did before this column existed.
+    report_id = Column(
+        Integer, ForeignKey("report.id", ondelete="SET NULL"), index=True
+    )
 
 class PressRelease(Base):
     __tablename__ = "press_release"
 
     id = Column(Integer, primary_key=True, nullable=False)
     title = Column(String)
-    url = Column(String, nullable=False)
+    url = Column(String, nullable=False, unique=True)
     category_id = Column(Integer, nullable=False)
     description = Column(String)
     report_id = Column(Integer)
@@ -57,8 +97,40 @@ class PressRelease(Base):
     meta_desc = Column(String)
     meta_keyword = Column(String)
     cover_img = Column(String)
-    created_date = Column(String)
-    
+    created_date = Column(DateTime(timezone=True))
+    updated_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+    tsv = deferred(
+        Column(
+            TSVECTOR,
+            Computed("to_tsvector('english', coalesce(title, ''))", persisted=True),
+        )
+    )
+
+    __table_args__ = (
+        # created_date DESC NULLS LAST, id DESC; see app/utils/pagination.py.
+        Index(
+            "ix_pr_created_sort",
+            func.coalesce(created_date, literal_column("'-infinity'::timestamptz")).desc(),
+            id.desc(),
+        ),
+        Index("ix_pr_category_created", category_id, created_date.desc()),
+        Index("ix_pr_tsv", "tsv", postgresql_using="gin"),
+    )
+    # Don't fetch the generated tsv column back after INSERT/UPDATE.
+    __mapper_args__ = {"eager_defaults": False}
+
+    # There is no FK constraint on category_id in the database.
+    category = relationship(
+        "Category",
+        primaryjoin="foreign(PressRelease.category_id) == Category.id",
+        viewonly=True,
+    )
+
 class Price(Base):
     __tablename__ = "price"
 
@@ -1,13 +1,27 @@
+import time
 from typing import List
-from fastapi import Depends, APIRouter, HTTPException, File, UploadFile
-from sqlalchemy.orm import Session
+from fastapi import BackgroundTasks, Depends, APIRouter, HTTPException, File, UploadFile
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
 from app.models import Category
-from app.database import get_db
+from app.database import get_async_db
+from app.routers.press_release import (
+    PRESS_RELEASE_CATEGORY_COUNT_CACHE_KEY,
+    PRESS_RELEASE_CATEGORY_COUNT_PATH,
+)
+from app.utils.bulk import chunked
+from app.utils.cache import CATALOG_CACHE_CONTROL, cached, invalidate, purge_cdn
+from app.utils.errors import integrity_error_detail
 from pydantic import BaseModel
 import os
 
 router = APIRouter()
 
+CATEGORY_LIST_CACHE_KEY = "category:list"
+CATEGORY_CDN_PATHS = ("/category/", PRESS_RELEASE_CATEGORY_COUNT_PATH)
+
 # class CreatePriceRequest(BaseModel):
 #     license: str
 #     price: str
@@ -23,40 +37,99 @@ class CreateCategoryRequest(BaseModel):
     meta_desc: str
     meta_keyword: str
 
+
+# Category names -> ids, for mapping imported spreadsheets onto the table.
+# Kept in memory like the price list: writes here reset it and the TTL bounds
+# how long other worker processes can use a stale map.
+CATEGORY_IDS_TTL = 300
+_category_ids_by_name = None
+_category_ids_loaded_at = 0.0
+
+
+async def get_category_ids_by_name(db: AsyncSession):
+    global _category_ids_by_name, _category_ids_loaded_at
+    if (
+        _category_ids_by_name is None
+        or time.monotonic() - _category_ids_loaded_at > CATEGORY_IDS_TTL
+    ):
+        rows = await db.execute(select(Category.name, Category.id))
+        _category_ids_by_name = dict(rows.all())
+        _category_ids_loaded_at = time.monotonic()
+    return _category_ids_by_name
+
+
+def reset_category_ids_by_name():
+    global _category_ids_by_name
+    _category_ids_by_name = None
+
+
 @router.post("/")
 async def create_category(
-    category: CreateCategoryRequest, db: Session = Depends(get_db)
+    category: CreateCategoryRequest,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
 ):
-    db_category = category(**category.dict())
+    db_category = Category(**category.dict())
     db.add(db_category)
-    db.commit()
-    db.refresh(db_category)
+    await db.commit()
+    reset_category_ids_by_name()
+    await invalidate(CATEGORY_LIST_CACHE_KEY, PRESS_RELEASE_CATEGORY_COUNT_CACHE_KEY)
+    background_tasks.add_task(purge_cdn, *CATEGORY_CDN_PATHS)
     return {"data": db_category}
 @router.post("/bulk")
 async def create_category_bulk(
-    categories: list[CreateCategoryRequest], db: Session = Depends(get_db)
+    categories: list[CreateCategoryRequest],
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
 ):
-    for category in categories:
-        db_category = Category(**category.dict())
-        db.add(db_category)
-        db.commit()
-        db.refresh(db_category)
+    stmt = insert(Category).returning(Category, sort_by_parameter_order=True)
+    inserted = 0
+    db_category = None
+    try:
+        for chunk in chunked(category.dict() for category in categories):
+            db_category = (await db.scalars(stmt, chunk)).all()[-1]
+            inserted += len(chunk)
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail=integrity_error_detail(
+                f"Bulk insert failed after {inserted} categories, none were saved", e
+            ),
+        )
+    reset_category_ids_by_name()
+    await invalidate(CATEGORY_LIST_CACHE_KEY, PRESS_RELEASE_CATEGORY_COUNT_CACHE_KEY)
+    background_tasks.add_task(purge_cdn, *CATEGORY_CDN_PATHS)
+    # The last category created, as this endpoint has always returned.
     return {"data": db_category}
 
 
 @router.get("/")
-async def get_category(db: Session = Depends(get_db)):
-    category_list = db.query(Category).order_by(Category.name.asc()).all()
+@cached(CATEGORY_LIST_CACHE_KEY, cache_control=CATALOG_CACHE_CONTROL)
+async def get_category(db: AsyncSession = Depends(get_async_db)):
+    stmt = select(Category).options(raiseload("*")).order_by(Category.name.asc())
+    category_list = (await db.execute(stmt)).scalars().all()
     return {"data": category_list}
 
 @router.get("/{category_id}")
-async def get_category_by_id(category_id: int, db: Session = Depends(get_db)):
-    categoryData = db.query(Category).filter(Category.id == category_id).first()
+async def get_category_by_id(
+    category_id: int, db: AsyncSession = Depends(get_async_db)
+):
+    stmt = select(Category).options(raiseload("*")).where(Category.id == category_id)
+    categoryData = (await db.execute(stmt)).scalar_one_or_none()
+    if categoryData is None:
+        raise HTTPException(status_code=404, detail="Category not found")
     return {"data": categoryData}
 
 @router.get("/url/{category_url}")
-async def get_category_by_url(category_url: str, db: Session = Depends(get_db)):
-    categoryData = db.query(Category).filter(Category.url == category_url).first()
+async def get_category_by_url(
+    category_url: str, db: AsyncSession = Depends(get_async_db)
+):
+    stmt = select(Category).options(raiseload("*")).where(Category.url == category_url)
+    categoryData = (await db.execute(stmt)).scalar_one_or_none()
+    if categoryData is None:
+        raise HTTPException(status_code=404, detail="Category not found")
     return {"data": categoryData}
 
 
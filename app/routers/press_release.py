@@ -1,12 +1,44 @@
-from fastapi import Depends, APIRouter, HTTPException
-from pydantic import BaseModel
-from sqlalchemy.orm import Session
+import hashlib
+from typing import List, Optional
+from fastapi import BackgroundTasks, Depends, APIRouter, HTTPException, Request
+from pydantic import AliasPath, BaseModel, ConfigDict, Field
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager, load_only, raiseload, selectinload
 from app.models import Category, PressRelease
-from app.database import get_db
-from sqlalchemy import DateTime, func, or_
+from app.database import get_async_db
+from app.utils.bulk import chunked
+from app.utils.cache import CATALOG_CACHE_CONTROL, cached, invalidate, purge_cdn
+from app.utils.dates import CreatedDate
+from app.utils.errors import integrity_error_detail
+from app.utils.pagination import (
+    CreatedDateCursor,
+    CursorDate,
+    next_cursor,
+    paginate_by_created_date,
+)
+from app.utils.response import DataResponse, json_response
+from sqlalchemy import func, insert, lambda_stmt, select
+from sqlalchemy.exc import IntegrityError
 
 router = APIRouter()
 
+PRESS_RELEASE_LIST_CACHE_KEY = "press_release:list"
+PRESS_RELEASE_CATEGORY_COUNT_CACHE_KEY = "press_release:category_count"
+PRESS_RELEASE_URL_CACHE_KEY = "press_release:url:{press_release_url}"
+PRESS_RELEASE_META_CACHE_KEY = "press_release:meta:{press_release_url}"
+
+# Public paths served with CATALOG_CACHE_CONTROL, purged from the CDN on writes.
+PRESS_RELEASE_CATEGORY_COUNT_PATH = "/press_release/category/category_count"
+PRESS_RELEASE_CDN_PATHS = ("/press_release/latest", PRESS_RELEASE_CATEGORY_COUNT_PATH)
+
+
+def press_release_cache_keys(*urls):
+    keys = [PRESS_RELEASE_LIST_CACHE_KEY, PRESS_RELEASE_CATEGORY_COUNT_CACHE_KEY]
+    for url in urls:
+        keys.append(PRESS_RELEASE_URL_CACHE_KEY.format(press_release_url=url))
+        keys.append(PRESS_RELEASE_META_CACHE_KEY.format(press_release_url=url))
+    return keys
+
 
 class CreatePressReleaseRequest(BaseModel):
     category_id: int
@@ -19,7 +51,7 @@ class CreatePressReleaseRequest(BaseModel):
     report_id: int
     url: str
     cover_img: str
-    created_date: str
+    created_date: CreatedDate
 
 
 class UpdatePressReleaseRequest(BaseModel):
@@ -34,48 +66,73 @@ class UpdatePressReleaseRequest(BaseModel):
     report_id: int
     url: str
     cover_img: str
-    created_date: str
+    created_date: CreatedDate
 
 
 class GetPressRelease(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     report_id: int
     title: str
     category_id: int
-    category_url: str
-    category_name: str
-    category_abr: str
+    category_url: str = Field(validation_alias=AliasPath("category", "url"))
+    category_name: str = Field(validation_alias=AliasPath("category", "name"))
+    category_abr: str = Field(validation_alias=AliasPath("category", "abr"))
     summary: str
-    created_date: str
+    created_date: Optional[CreatedDate]
     url: str
     cover_img: str
 
 
 class GetLatestPressRelease(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     summary: str
-    created_date: str
+    created_date: Optional[CreatedDate]
     url: str
     cover_img: str
 
 
 class GetPressReleaseByUrl(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     report_id: int
     title: str
     description: str
     category_id: int
-    category_url: str
-    category_name: str
-    category_abr: str
+    category_url: str = Field(validation_alias=AliasPath("category", "url"))
+    category_name: str = Field(validation_alias=AliasPath("category", "name"))
+    category_abr: str = Field(validation_alias=AliasPath("category", "abr"))
     summary: str
-    created_date: str
+    created_date: Optional[CreatedDate]
     url: str
     cover_img: str
     meta_desc: str
     meta_keyword: str
 
 
+class GetPressReleaseDetail(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    title: Optional[str]
+    url: str
+    category_id: int
+    description: Optional[str]
+    report_id: Optional[int]
+    summary: Optional[str]
+    meta_title: Optional[str]
+    meta_desc: Optional[str]
+    meta_keyword: Optional[str]
+    cover_img: Optional[str]
+    created_date: Optional[CreatedDate]
+
+
 class GetPressReleaseMetaData(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     url: str
     meta_title: str
     meta_desc: str
@@ -83,372 +140,394 @@ class GetPressReleaseMetaData(BaseModel):
     summary: str
 
 
-@router.get("/")
-async def get_press_releases(db: Session = Depends(get_db)):
-    press_releases = (
-        db.query(PressRelease)
-        .join(Category, PressRelease.category_id == Category.id)
-        .with_entities(
-            PressRelease.id,
-            PressRelease.category_id,
-            PressRelease.report_id,
-            Category.url.label("category_url"),
-            Category.abr.label("category_abr"),
-            Category.name.label("category_name"),
-            PressRelease.summary,
-            PressRelease.title,
-            PressRelease.created_date,
-            PressRelease.url,
-            PressRelease.cover_img,
-        )
-        .all()
-    )
-    press_release_list = [
-        GetPressRelease(
-            id=press_release.id,
-            title=press_release.title,
-            report_id=press_release.report_id,
-            category_id=press_release.category_id,
-            category_name=press_release.category_name,
-            category_url=press_release.category_url,
-            category_abr=press_release.category_abr,
-            summary=press_release.summary,
-            created_date=press_release.created_date,
-            url=press_release.url,
-            cover_img=press_release.cover_img,
-        )
-        for press_release in press_releases
-    ]
-    return {"data": press_release_list}
+class GetCategoryWithCount(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
 
+    category_id: int
+    category_url: str
+    category_abr: Optional[str]
+    category_name: Optional[str]
+    category_back_cover: Optional[str]
+    category_icon: Optional[str]
+    count: int
 
-@router.get("/search")
-async def get_searched_press_releases(
-    page: int,
-    per_page: int,
-    keyword: str,
-    db: Session = Depends(get_db),
-):
-    offset = (page - 1) * per_page
 
-    press_releases = (
-        # db.query(Report)
-        db.query(PressRelease)
-        .join(Category, Category.id == PressRelease.category_id)
-        .with_entities(
-            PressRelease.id,
-            PressRelease.report_id,
-            PressRelease.category_id,
-            Category.abr.label("category_abr"),
-            Category.url.label("category_url"),
-            Category.name.label("category_name"),
-            PressRelease.summary,
-            PressRelease.title,
-            PressRelease.created_date,
-            PressRelease.url,
-            PressRelease.cover_img,
-        )
-        .filter(
-            # func.to_tsvector("english", Report.title).match(
-            #     keyword, postgresql_regconfig="english"
-            # )
-            or_(
-                func.to_tsvector("english", PressRelease.title).match(
-                    keyword, postgresql_regconfig="english"
-                ),
-                PressRelease.title.ilike(f"%{keyword}%"),
-            )
-        )
-        .order_by(func.cast(PressRelease.created_date, DateTime).desc())
-        .offset(offset)
-        .limit(per_page)
-        .all()
+PressReleaseListResponse = DataResponse[List[GetPressRelease]]
+LatestPressReleaseListResponse = DataResponse[List[GetLatestPressRelease]]
+PressReleaseByUrlResponse = DataResponse[GetPressReleaseByUrl]
+PressReleaseDetailResponse = DataResponse[GetPressReleaseDetail]
+PressReleaseMetaDataResponse = DataResponse[GetPressReleaseMetaData]
+CategoryWithCountListResponse = DataResponse[List[GetCategoryWithCount]]
+
+
+class CountedPressReleaseListResponse(PressReleaseListResponse):
+    total: int
+
+
+class PressReleasePage(CountedPressReleaseListResponse):
+    next_cursor: Optional[CreatedDateCursor] = None
+
+
+class LatestPressReleasePage(LatestPressReleaseListResponse):
+    next_cursor: Optional[CreatedDateCursor] = None
+
+
+def load_with_category(*columns, category_loader=selectinload):
+    # Load only the given press release columns plus the category fields the
+    # response models read. By default the categories are fetched in one
+    # follow-up SELECT ... WHERE id IN (...) instead of being joined onto
+    # every row; pass contains_eager when the query already joins Category.
+    return (
+        load_only(*columns, raiseload=True),
+        category_loader(PressRelease.category).load_only(
+            Category.url, Category.abr, Category.name, raiseload=True
+        ),
     )
 
-    press_release_list = [
-        GetPressRelease(
-            id=press_release.id,
-            title=press_release.title,
-            report_id=press_release.report_id,
-            category_id=press_release.category_id,
-            category_name=press_release.category_name,
-            category_url=press_release.category_url,
-            category_abr=press_release.category_abr,
-            summary=press_release.summary,
-            created_date=press_release.created_date,
-            url=press_release.url,
-            cover_img=press_release.cover_img,
-        )
-        for press_release in press_releases
-    ]
 
-    return {"data": press_release_list}
+PRESS_RELEASE_LIST_COLUMNS = (
+    PressRelease.id,
+    PressRelease.report_id,
+    PressRelease.category_id,
+    PressRelease.summary,
+    PressRelease.title,
+    PressRelease.created_date,
+    PressRelease.url,
+    PressRelease.cover_img,
+)
 
 
-@router.get("/category/category_count")
-async def get_press_release_category_count(db: Session = Depends(get_db)):
-    query = (
-        db.query(
+async def get_categories_with_count(db: AsyncSession):
+    # Every category with its press release count, including empty ones.
+    stmt = (
+        select(
             Category.id.label("category_id"),
             Category.url.label("category_url"),
             Category.abr.label("category_abr"),
             Category.name.label("category_name"),
             Category.back_cover.label("category_back_cover"),
             Category.icon.label("category_icon"),
-            func.count(PressRelease.category_id).label("count"),
+            func.count(PressRelease.id).label("count"),
         )
-        .join(Category, PressRelease.category_id == Category.id)
+        .outerjoin(PressRelease, PressRelease.category_id == Category.id)
         .group_by(Category.id)
         .order_by(Category.name.asc())
-        .all()
     )
-    result = [
-        {
-            "category_id": category_id,
-            "category_url": category_url,
-            "category_abr": category_abr,
-            "category_name": category_name,
-            "category_back_cover": category_back_cover,
-            "category_icon": category_icon,
-            "count": count,
-        }
-        for category_id, category_url, category_abr, category_name, category_back_cover, category_icon, count in query
-    ]
-    return {"data": result}
-
-
-@router.get("/latest")
-async def get_latest_reports(
-    page: int,
-    per_page: int,
-    db: Session = Depends(get_db),
-):
-    offset = (page - 1) * per_page
+    return (await db.execute(stmt)).mappings().all()
 
-    press_releases = (
-        db.query(PressRelease)
-        .with_entities(
-            PressRelease.summary,
-            PressRelease.created_date,
-            PressRelease.url,
-            PressRelease.cover_img,
+
+def count_rows(stmt):
+    # SELECT count(*) over the statement's FROM and WHERE, without its page.
+    return stmt + (
+        lambda s: s.limit(None)
+        .offset(None)
+        .order_by(None)
+        .with_only_columns(func.count(), maintain_column_froms=True)
+    )
+
+
+async def fetch_with_total(db: AsyncSession, stmt):
+    # count(*) OVER () is evaluated before LIMIT/OFFSET, so every row of the
+    # page carries the number of rows matching the filters.
+    rows = (
+        await db.execute(
+            stmt + (lambda s: s.add_columns(func.count().over().label("total")))
         )
-        .order_by(
-            func.cast(PressRelease.created_date, DateTime).desc(),
-            PressRelease.created_date.asc(),
+    ).all()
+    if rows:
+        return [row.PressRelease for row in rows], rows[0].total
+    # A page past the end has no row to carry the total.
+    return [], await db.scalar(count_rows(stmt))
+
+
+@router.get("/", response_model=PressReleaseListResponse)
+@cached(PRESS_RELEASE_LIST_CACHE_KEY, response_model=PressReleaseListResponse)
+async def get_press_releases(db: AsyncSession = Depends(get_async_db)):
+    stmt = lambda_stmt(
+        lambda: select(PressRelease)
+        .options(*load_with_category(*PRESS_RELEASE_LIST_COLUMNS))
+        .where(PressRelease.category.has())
+    )
+    press_releases = (await db.execute(stmt)).scalars().all()
+    return {"data": press_releases}
+
+
+@router.get("/search", response_model=PressReleasePage)
+async def get_searched_press_releases(
+    per_page: int,
+    keyword: str,
+    page: int = 1,
+    after_created_date: Optional[CursorDate] = None,
+    after_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    matching = lambda_stmt(
+        lambda: select(PressRelease)
+        .options(*load_with_category(*PRESS_RELEASE_LIST_COLUMNS))
+        .where(
+            PressRelease.tsv.op("@@")(func.websearch_to_tsquery("english", keyword)),
+            PressRelease.category.has(),
         )
-        .offset(offset)
-        .limit(per_page)
-        .all()
     )
+    stmt = paginate_by_created_date(
+        matching, PressRelease, page, per_page, after_created_date, after_id
+    )
+    if after_id is None:
+        press_releases, total = await fetch_with_total(db, stmt)
+    else:
+        # A window count would only see the rows after the cursor, so the
+        # total would shrink page by page; count every match instead.
+        press_releases = (await db.execute(stmt)).scalars().all()
+        total = await db.scalar(count_rows(matching))
+
+    return json_response(
+        PressReleasePage,
+        {
+            "data": press_releases,
+            "total": total,
+            "next_cursor": next_cursor(press_releases, per_page),
+        },
+    )
+
+
+@router.get("/category/category_count", response_model=CategoryWithCountListResponse)
+@cached(
+    PRESS_RELEASE_CATEGORY_COUNT_CACHE_KEY,
+    response_model=CategoryWithCountListResponse,
+    cache_control=CATALOG_CACHE_CONTROL,
+)
+async def get_press_release_category_count(
+    db: AsyncSession = Depends(get_async_db),
+):
+    return {"data": await get_categories_with_count(db)}
+
 
-    press_release_list = [
-        GetLatestPressRelease(
-            summary=press_release.summary,
-            created_date=press_release.created_date,
-            url=press_release.url,
-            cover_img=press_release.cover_img,
+@router.get("/latest", response_model=LatestPressReleasePage)
+async def get_latest_reports(
+    per_page: int,
+    page: int = 1,
+    after_created_date: Optional[CursorDate] = None,
+    after_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    stmt = lambda_stmt(
+        lambda: select(PressRelease).options(
+            load_only(
+                PressRelease.id,
+                PressRelease.summary,
+                PressRelease.created_date,
+                PressRelease.url,
+                PressRelease.cover_img,
+                raiseload=True,
+            ),
+            raiseload("*"),
         )
-        for press_release in press_releases
-    ]
+    )
+    stmt = paginate_by_created_date(
+        stmt, PressRelease, page, per_page, after_created_date, after_id
+    )
+    press_releases = (await db.execute(stmt)).scalars().all()
 
-    return {"data": press_release_list}
+    response = json_response(
+        LatestPressReleasePage,
+        {"data": press_releases, "next_cursor": next_cursor(press_releases, per_page)},
+    )
+    response.headers["Cache-Control"] = CATALOG_CACHE_CONTROL
+    return response
 
 
-@router.get("/category/{category_url}")
+@router.get(
+    "/category/{category_url}", response_model=CountedPressReleaseListResponse
+)
 async def get_press_release_by_category_url(
     category_url: str,
     page: int,
     per_page: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     offset = (page - 1) * per_page
 
+    stmt = lambda_stmt(
+        lambda: select(PressRelease)
+        .options(*load_with_category(*PRESS_RELEASE_LIST_COLUMNS))
+        .offset(offset)
+        .limit(per_page)
+    )
     if category_url == "all-industries":
-        press_releases = (
-            # db.query(Report)
-            db.query(PressRelease)
-            .join(Category, PressRelease.category_id == Category.id)
-            .with_entities(
-                PressRelease.id,
-                PressRelease.report_id,
-                PressRelease.category_id,
-                Category.abr.label("category_abr"),
-                Category.url.label("category_url"),
-                Category.name.label("category_name"),
-                PressRelease.summary,
-                PressRelease.title,
-                PressRelease.created_date,
-                PressRelease.url,
-                PressRelease.cover_img,
-            )
-            # .filter(Category.url == category_url)
-            .offset(offset)
-            .limit(per_page)
-            .all()
-        )
+        stmt += lambda s: s.where(PressRelease.category.has())
     else:
-        press_releases = (
-            # db.query(Report)
-            db.query(PressRelease)
-            .join(Category, PressRelease.category_id == Category.id)
-            .with_entities(
-                PressRelease.id,
-                PressRelease.report_id,
-                PressRelease.category_id,
-                Category.abr.label("category_abr"),
-                Category.url.label("category_url"),
-                Category.name.label("category_name"),
-                PressRelease.summary,
-                PressRelease.title,
-                PressRelease.created_date,
-                PressRelease.url,
-                PressRelease.cover_img,
-            )
-            .filter(Category.url == category_url)
-            .offset(offset)
-            .limit(per_page)
-            .all()
-        )
-
-    press_release_list = [
-        GetPressRelease(
-            id=press_release.id,
-            title=press_release.title,
-            report_id=press_release.report_id,
-            category_id=press_release.category_id,
-            category_name=press_release.category_name,
-            category_url=press_release.category_url,
-            category_abr=press_release.category_abr,
-            summary=press_release.summary,
-            created_date=press_release.created_date,
-            url=press_release.url,
-            cover_img=press_release.cover_img,
-        )
-        for press_release in press_releases
-    ]
+        stmt += lambda s: s.where(PressRelease.category.has(Category.url == category_url))
+    press_releases, total = await fetch_with_total(db, stmt)
 
-    return {"data": press_release_list}
+    return json_response(
+        CountedPressReleaseListResponse, {"data": press_releases, "total": total}
+    )
 
 
-@router.get("/{press_release_id}")
-async def get_press_release_by_id(press_release_id: int, db: Session = Depends(get_db)):
+@router.get("/{press_release_id}", response_model=PressReleaseDetailResponse)
+async def get_press_release_by_id(
+    press_release_id: int, db: AsyncSession = Depends(get_async_db)
+):
     press_release = (
-        db.query(PressRelease).filter(PressRelease.id == press_release_id).first()
-    )
+        await db.execute(
+            select(PressRelease)
+            .options(raiseload("*"))
+            .where(PressRelease.id == press_release_id)
+        )
+    ).scalar_one_or_none()
+    if press_release is None:
+        raise HTTPException(status_code=404, detail="Press Release not found")
     return {"data": press_release}
 
 
-@router.get("/url/{press_release_url}")
+def press_release_etag(result):
+    press_release = result["data"]
+    version = f"{press_release.id}:{press_release.updated_at.isoformat()}"
+    return f'"{hashlib.blake2b(version.encode(), digest_size=8).hexdigest()}"'
+
+
+@router.get("/url/{press_release_url}", response_model=PressReleaseByUrlResponse)
+@cached(
+    PRESS_RELEASE_URL_CACHE_KEY,
+    ttl=600,
+    response_model=PressReleaseByUrlResponse,
+    etag=press_release_etag,
+)
 async def get_press_release_by_url(
-    press_release_url: str, db: Session = Depends(get_db)
+    press_release_url: str,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
 ):
-    press_release = (
-        db.query(PressRelease)
-        .join(Category, PressRelease.category_id == Category.id)
-        .with_entities(
-            PressRelease.id,
-            PressRelease.url,
-            PressRelease.report_id,
-            PressRelease.category_id,
-            Category.name.label("category_name"),
-            Category.url.label("category_url"),
-            Category.abr.label("category_abr"),
-            PressRelease.title,
-            PressRelease.summary,
-            PressRelease.description,
-            PressRelease.cover_img,
-            PressRelease.created_date,
-            PressRelease.meta_desc,
-            PressRelease.meta_keyword,
+    stmt = (
+        select(PressRelease)
+        .join(PressRelease.category)
+        .options(
+            *load_with_category(
+                *PRESS_RELEASE_LIST_COLUMNS,
+                PressRelease.description,
+                PressRelease.meta_desc,
+                PressRelease.meta_keyword,
+                PressRelease.updated_at,
+                category_loader=contains_eager,
+            )
         )
-        .filter(PressRelease.url == press_release_url)
-        .first()
-    )
-    press_release_result = GetPressReleaseByUrl(
-        id=press_release.id,
-        url=press_release.url,
-        report_id=press_release.report_id,
-        category_id=press_release.category_id,
-        category_url=press_release.category_url,
-        category_name=press_release.category_name,
-        category_abr=press_release.category_abr,
-        summary=press_release.summary,
-        title=press_release.title,
-        cover_img=press_release.cover_img,
-        description=press_release.description,
-        meta_desc=press_release.meta_desc,
-        meta_keyword=press_release.meta_keyword,
-        created_date=press_release.created_date,
+        .where(PressRelease.url == press_release_url)
     )
+    press_release = (await db.execute(stmt)).scalars().first()
+    if press_release is None:
+        raise HTTPException(status_code=404, detail="Press Release not found")
 
-    return {"data": press_release_result}
+    return {"data": press_release}
 
 
-@router.get("/meta/{press_release_url}")
+@router.get(
+    "/meta/{press_release_url}", response_model=PressReleaseMetaDataResponse
+)
+@cached(PRESS_RELEASE_META_CACHE_KEY, response_model=PressReleaseMetaDataResponse)
 async def get_press_release_meta_by_url(
-    press_release_url: str, db: Session = Depends(get_db)
+    press_release_url: str, db: AsyncSession = Depends(get_async_db)
 ):
-    press_release = (
-        db.query(PressRelease)
-        .with_entities(
-            PressRelease.url,
-            PressRelease.meta_title,
-            PressRelease.meta_desc,
-            PressRelease.meta_keyword,
-            PressRelease.summary,
-        )
-        .filter(PressRelease.url == press_release_url)
-        .first()
-    )
-    press_release_result = GetPressReleaseMetaData(
-        url=press_release.url,
-        meta_title=press_release.meta_title,
-        meta_desc=press_release.meta_desc,
-        meta_keyword=press_release.meta_keyword,
-        summary=press_release.summary,
-    )
+    stmt = select(
+        PressRelease.url,
+        PressRelease.meta_title,
+        PressRelease.meta_desc,
+        PressRelease.meta_keyword,
+        PressRelease.summary,
+    ).where(PressRelease.url == press_release_url)
+    press_release = (await db.execute(stmt)).mappings().first()
+    if press_release is None:
+        raise HTTPException(status_code=404, detail="Press Release not found")
 
-    return {"data": press_release_result}
+    return {"data": press_release}
 
 
-@router.post("/")
+@router.post("/", response_model=PressReleaseDetailResponse)
 async def create_press_release(
-    press_release: CreatePressReleaseRequest, db: Session = Depends(get_db)
+    press_release: CreatePressReleaseRequest,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
 ):
     db_press_release = PressRelease(**press_release.dict())
     db.add(db_press_release)
-    db.commit()
-    db.refresh(db_press_release)
+    await db.commit()
+    await invalidate(*press_release_cache_keys(db_press_release.url))
+    background_tasks.add_task(purge_cdn, *PRESS_RELEASE_CDN_PATHS)
     return {"data": db_press_release}
 
 
-@router.put("/{press_release_id}")
+@router.post("/bulk")
+async def create_press_release_bulk(
+    press_releases: list[CreatePressReleaseRequest],
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+):
+    stmt = insert(PressRelease).returning(
+        PressRelease.id, sort_by_parameter_order=True
+    )
+    ids = []
+    try:
+        for chunk in chunked(press_release.dict() for press_release in press_releases):
+            ids.extend((await db.execute(stmt, chunk)).scalars().all())
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail=integrity_error_detail(
+                f"Bulk insert failed after {len(ids)} press releases, none were saved", e
+            ),
+        )
+    await invalidate(*press_release_cache_keys(*(p.url for p in press_releases)))
+    background_tasks.add_task(purge_cdn, *PRESS_RELEASE_CDN_PATHS)
+    return {"data": ids}
+
+
+@router.put("/{press_release_id}", response_model=PressReleaseDetailResponse)
 async def update_press_release(
-    new_press_release: UpdatePressReleaseRequest, db: Session = Depends(get_db)
+    new_press_release: UpdatePressReleaseRequest,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
 ):
     existing_press_release = (
-        db.query(PressRelease).filter(PressRelease.id == new_press_release.id).first()
-    )
+        await db.execute(
+            select(PressRelease)
+            .options(raiseload("*"))
+            .where(PressRelease.id == new_press_release.id)
+        )
+    ).scalar_one_or_none()
     if existing_press_release is None:
         raise HTTPException(status_code=404, detail="Press Release not found")
+    previous_url = existing_press_release.url
 
     for attr, value in new_press_release.dict().items():
         setattr(existing_press_release, attr, value)
 
-    db.commit()
-    db.refresh(existing_press_release)
+    await db.commit()
+    await invalidate(
+        *press_release_cache_keys(previous_url, existing_press_release.url)
+    )
+    background_tasks.add_task(purge_cdn, *PRESS_RELEASE_CDN_PATHS)
     return {"data": existing_press_release}
 
 
 @router.delete("/{press_release_id}")
-async def delete_press_release(press_release_id: int, db: Session = Depends(get_db)):
+async def delete_press_release(
+    press_release_id: int,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+):
     press_release = (
-        db.query(PressRelease).filter(PressRelease.id == press_release_id).first()
-    )
+        await db.execute(
+            select(PressRelease)
+            .options(raiseload("*"))
+            .where(PressRelease.id == press_release_id)
+        )
+    ).scalar_one_or_none()
     if press_release is None:
         raise HTTPException(status_code=404, detail="Press Release not found")
 
-    db.delete(press_release)
-    db.commit()
+    await db.delete(press_release)
+    await db.commit()
+    await invalidate(*press_release_cache_keys(press_release.url))
+    background_tasks.add_task(purge_cdn, *PRESS_RELEASE_CDN_PATHS)
     return {"message": "Press Release deleted"}
@@ -1,15 +1,19 @@
+import time
 from typing import List
 from fastapi import Depends, APIRouter, HTTPException, File, UploadFile
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models import Report, Price  # Import the Price model
-from app.database import get_db
-from pydantic import BaseModel
+from app.database import get_async_db
+from pydantic import BaseModel, ConfigDict
 import os
 
 router = APIRouter()
 
 
 class GetPrice(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     license: str
     price: str
@@ -26,56 +30,78 @@ class UpdatePriceRequest(BaseModel):
     price: str
 
 
+# The price table is a handful of rows that only change through this router,
+# so the list is kept in memory. Writes reset it; the TTL bounds how long
+# other worker processes can serve a stale list.
+PRICE_LIST_TTL = 300
+_price_list = None
+_price_list_loaded_at = 0.0
+
+
+async def get_price_list(db: AsyncSession):
+    global _price_list, _price_list_loaded_at
+    if _price_list is None or time.monotonic() - _price_list_loaded_at > PRICE_LIST_TTL:
+        prices = (await db.execute(select(Price))).scalars().all()
+        _price_list = [GetPrice.model_validate(price) for price in prices]
+        _price_list_loaded_at = time.monotonic()
+    return _price_list
+
+
+def reset_price_list():
+    global _price_list
+    _price_list = None
+
 
 @router.post("/")
 async def create_price(
-    price: CreatePriceRequest, db: Session = Depends(get_db)
+    price: CreatePriceRequest, db: AsyncSession = Depends(get_async_db)
 ):
     db_price = Price(**price.dict())
     db.add(db_price)
-    db.commit()
-    db.refresh(db_price)
+    await db.commit()
+    reset_price_list()
     return {"data": db_price}
 
 
 @router.get("/")
-async def get_price(db: Session = Depends(get_db)):
-    priceList = db.query(Price).all()
-    return {"data": priceList}
+async def get_price(db: AsyncSession = Depends(get_async_db)):
+    return {"data": await get_price_list(db)}
 
 @router.get("/{price_id}")
-async def get_price_by_id(price_id: int, db: Session = Depends(get_db)):
-    priceData = db.query(Price).filter(Price.id == price_id).first()
+async def get_price_by_id(price_id: int, db: AsyncSession = Depends(get_async_db)):
+    stmt = select(Price).where(Price.id == price_id)
+    priceData = (await db.execute(stmt)).scalar_one_or_none()
     return {"data": priceData}
 
 
 @router.put("/{price_id}")
 async def update_price(
-    new_price: UpdatePriceRequest, db: Session = Depends(get_db)
+    new_price: UpdatePriceRequest, db: AsyncSession = Depends(get_async_db)
 ):
     existing_price = (
-        db.query(Price).filter(Price.id == new_price.id).first()
-    )
+        await db.execute(select(Price).where(Price.id == new_price.id))
+    ).scalar_one_or_none()
     if existing_price is None:
         raise HTTPException(status_code=404, detail="Price not found")
 
     for attr, value in new_price.dict().items():
         setattr(existing_price, attr, value)
 
-    db.commit()
-    db.refresh(existing_price)
+    await db.commit()
+    reset_price_list()
     return {"data": existing_price}
 
 
 @router.delete("/{price_id}")
-async def delete_price(price_id: int, db: Session = Depends(get_db)):
+async def delete_price(price_id: int, db: AsyncSession = Depends(get_async_db)):
     price = (
-        db.query(Price).filter(Price.id == price_id).first()
-    )
+        await db.execute(select(Price).where(Price.id == price_id))
+    ).scalar_one_or_none()
     if price is None:
         raise HTTPException(status_code=404, detail="Price not found")
 
-    db.delete(price)
-    db.commit()
+    await db.delete(price)
+    await db.commit()
+    reset_price_list()
     return {"message": "Price deleted"}
 
@@ -1,21 +1,59 @@
 from typing import List, Optional
 from fastapi import Depends, APIRouter, HTTPException, File, Response,  UploadFile
-from pydantic import BaseModel
-from sqlalchemy.orm import Session
-from app.models import Category, Report, ReportImage, Price
-from app.database import get_db
-from sqlalchemy import DateTime, desc, func, or_
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, load_only, raiseload
+from app.models import Category, Report, ReportImage
+from app.database import get_async_db
+from app.utils.bulk import chunked
+from app.utils.cache import cached, invalidate, invalidate_matching
+from app.utils.dates import LEGACY_DATE_FORMAT, CreatedDate
+from app.utils.errors import integrity_error_detail
+from app.utils.pagination import (
+    CreatedDateCursor,
+    CursorDate,
+    next_cursor,
+    paginate_by_created_date,
+)
+from app.utils.response import DataResponse, json_response
+from sqlalchemy import desc, func, insert, lambda_stmt, or_, select
+from sqlalchemy.exc import IntegrityError
 import os
 import io
+import uuid
 from datetime import datetime
 from PIL import Image
+from starlette.concurrency import run_in_threadpool
 import pandas as pd
-import json
 
+from app.routers.category import get_category_ids_by_name
+from app.routers.press_release import CategoryWithCountListResponse
+from app.routers.price import get_price_list
 from app.routers.report_image import CreateReportImageRequest, UpdateReportImageRequest
 
 router = APIRouter()
 
+REPORT_LIST_CACHE_KEY = "report:list"
+REPORT_CATEGORY_COUNT_CACHE_KEY = "report:category_count"
+REPORT_URL_CACHE_KEY = "report:url:{report_url}"
+REPORT_META_CACHE_KEY = "report:meta:{report_url}"
+REPORT_CATEGORY_PAGE_CACHE_KEY = (
+    "report:category:{category_url}:{page}:{per_page}:{after_created_date}:{after_id}"
+)
+
+
+def report_cache_keys(*urls):
+    keys = [REPORT_LIST_CACHE_KEY, REPORT_CATEGORY_COUNT_CACHE_KEY]
+    for url in urls:
+        keys.append(REPORT_URL_CACHE_KEY.format(report_url=url))
+        keys.append(REPORT_META_CACHE_KEY.format(report_url=url))
+    return keys
+
+
+async def invalidate_reports(*urls):
+    await invalidate(*report_cache_keys(*urls))
+    await invalidate_matching("report:category:*")
+
 
 class CreateReport(BaseModel):
     title: str
@@ -31,7 +69,7 @@ class CreateReport(BaseModel):
     meta_keyword: str
     pages: str
     cover_img: str
-    created_date: str
+    created_date: CreatedDate
 
 
 class CreateReportWithImages(BaseModel):
@@ -54,10 +92,12 @@ class UpdateReport(BaseModel):
     meta_keyword: str
     pages: str
     cover_img: str
-    created_date: str
+    created_date: CreatedDate
 
 
 class GetReport(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     url: str
     category_id: int
@@ -67,10 +107,45 @@ class GetReport(BaseModel):
     summary: str
     pages: str
     cover_img: str
-    created_date: str
+    created_date: Optional[CreatedDate]
+
+
+class GetReportDetail(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    title: str
+    url: str
+    category_id: int
+    summary: Optional[str]
+    description: Optional[str]
+    toc: Optional[str]
+    highlights: Optional[str]
+    faqs: Optional[str]
+    meta_title: Optional[str]
+    meta_desc: Optional[str]
+    meta_keyword: Optional[str]
+    pages: Optional[str]
+    cover_img: Optional[str]
+    created_date: Optional[CreatedDate]
+
+
+class GetReportView(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    title: str
+    url: str
+    category_id: int
+    summary: Optional[str]
+    pages: Optional[str]
+    cover_img: Optional[str]
+    created_date: Optional[CreatedDate]
 
 
 class GetLatestReport(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     title: str
     url: str
     summary: str
@@ -78,6 +153,8 @@ class GetLatestReport(BaseModel):
 
 
 class GetReportByUrl(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     title: str
     url: str
@@ -95,9 +172,12 @@ class GetReportByUrl(BaseModel):
     meta_keyword: str
     pages: str
     cover_img: str
-    created_date: str
-    
+    created_date: Optional[CreatedDate]
+
+
 class GetReportMetaData(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     url: str
     meta_title: str
     meta_desc: str
@@ -105,49 +185,64 @@ class GetReportMetaData(BaseModel):
     summary: str
 
 
-@router.get("/")
-async def get_reports(db: Session = Depends(get_db)):
-    reports = (
-        db.query(Report)
+ReportListResponse = DataResponse[List[GetReport]]
+LatestReportListResponse = DataResponse[List[GetLatestReport]]
+ReportByUrlResponse = DataResponse[GetReportByUrl]
+ReportMetaDataResponse = DataResponse[GetReportMetaData]
+
+
+class ReportPage(ReportListResponse):
+    next_cursor: Optional[CreatedDateCursor] = None
+
+
+class LatestReportPage(LatestReportListResponse):
+    next_cursor: Optional[CreatedDateCursor] = None
+
+
+REPORT_LIST_COLUMNS = (
+    Report.id,
+    Report.url,
+    Report.category_id,
+    Category.name.label("category_name"),
+    Category.url.label("category_url"),
+    Report.title,
+    Report.summary,
+    Report.pages,
+    Report.cover_img,
+    Report.created_date,
+)
+
+
+@router.get("/", response_model=ReportListResponse)
+@cached(REPORT_LIST_CACHE_KEY, ttl=3600, response_model=ReportListResponse)
+async def get_reports(db: AsyncSession = Depends(get_async_db)):
+    stmt = lambda_stmt(
+        lambda: select(*REPORT_LIST_COLUMNS)
         .join(Category, Report.category_id == Category.id)
-        .with_entities(
-            Report.id,
-            Report.url,
-            Report.category_id,
-            Category.name.label("category_name"),
-            Category.url.label("category_url"),
-            Report.title,
-            Report.summary,
-            Report.pages,
-            Report.cover_img,
-            Report.created_date,
-        )
         .order_by(Report.id.desc())
-        .all()
     )
-    report_list = [
-        GetReport(
-            id=report.id,
-            url=report.url,
-            category_id=report.category_id,
-            category_url=report.category_url,
-            category_name=report.category_name,
-            summary=report.summary,
-            title=report.title,
-            cover_img=report.cover_img,
-            pages=report.pages,
-            created_date=report.created_date,
+    reports = (await db.execute(stmt)).all()
+    return {"data": reports}
+
+def reports_to_excel(reports):
+    df = pd.DataFrame(reports)
+    if not df.empty:
+        # Excel can't store timezone-aware datetimes; export the legacy format.
+        df["created_date"] = pd.to_datetime(df["created_date"], utc=True).dt.strftime(
+            LEGACY_DATE_FORMAT
         )
-        for report in reports
-    ]
-    return {"data": report_list}
+    
+    output = io.BytesIO()
+    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        df.to_excel(writer, index=False)
+    
+    return output.getvalue()
+
 
 @router.get("/excel-report")
-async def get_reports_for_excel_(db: Session = Depends(get_db)):
-    reports = (
-        db.query(Report)
-        .join(Category, Report.category_id == Category.id)
-        .with_entities(
+async def get_reports_for_excel_(db: AsyncSession = Depends(get_async_db)):
+    stmt = (
+        select(
             Report.id,
             Report.url,
             Category.name.label("category_name"),
@@ -158,29 +253,31 @@ async def get_reports_for_excel_(db: Session = Depends(get_db)):
             Report.description,
             Report.toc,
             Report.highlights,
-    
         )
+        .join(Category, Report.category_id == Category.id)
         .order_by(Report.id)
         # .limit(5)
-        .all()
     )
-    df = pd.DataFrame(reports)
-    
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, index=False)
-    
-    output.seek(0)
-    
+    reports = (await db.execute(stmt)).all()
+    # Hand the connection back to the pool before building the workbook,
+    # which takes far longer than the query.
+    await db.close()
+    content = await run_in_threadpool(reports_to_excel, reports)
+
     headers = {
         'Content-Disposition': 'attachment; filename="output.xlsx"'
     }
-    return Response(content=output.read(), media_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', headers=headers)
-
-@router.get("/category/category_count")
-async def get_category_count(db: Session = Depends(get_db)):
-    query = (
-        db.query(
+    return Response(content=content, media_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', headers=headers)
+
+@router.get("/category/category_count", response_model=CategoryWithCountListResponse)
+@cached(
+    REPORT_CATEGORY_COUNT_CACHE_KEY,
+    ttl=3600,
+    response_model=CategoryWithCountListResponse,
+)
+async def get_category_count(db: AsyncSession = Depends(get_async_db)):
+    stmt = (
+        select(
             Category.id.label("category_id"),
             Category.url.label("category_url"),
             Category.abr.label("category_abr"),
@@ -192,147 +289,144 @@ async def get_category_count(db: Session = Depends(get_db)):
         .join(Report, Category.id == Report.category_id)
         .group_by(Category.id)
         .order_by(Category.name.asc())
-        .all()
     )
-    result = [
-        {
-            "category_id": category_id,
-            "category_url": category_url,
-            "category_abr": category_abr,
-            "category_name": category_name,
-            "category_back_cover": category_back_cover,
-            "category_icon": category_icon,
-            "count": count,
-        }
-        for category_id, category_url, category_abr, category_name, category_back_cover, category_icon, count in query
-    ]
-    return {"data": result}
+    categories = (await db.execute(stmt)).all()
+    return {"data": categories}
 
 
-@router.get("/latest")
+@router.get("/latest", response_model=LatestReportPage)
 async def get_latest_reports(
-    page: int,
     per_page: int,
-    db: Session = Depends(get_db),
+    page: int = 1,
+    after_created_date: Optional[CursorDate] = None,
+    after_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db),
 ):
-    offset = (page - 1) * per_page
-
-    reports = (
-        db.query(Report)
-        .with_entities(
+    stmt = lambda_stmt(
+        lambda: select(
+            Report.id,
             Report.title,
             Report.url,
             Report.summary,
             Report.cover_img,
+            Report.created_date,
         )
-        .order_by(func.cast(Report.created_date, DateTime).desc(), Report.id.asc())
-        .offset(offset)
-        .limit(per_page)
-        .all()
     )
+    stmt = paginate_by_created_date(
+        stmt, Report, page, per_page, after_created_date, after_id
+    )
+    reports = (await db.execute(stmt)).all()
 
-    report_list = [
-        GetLatestReport(
-            title=report.title,
-            url=report.url,
-            summary=report.summary,
-            cover_img=report.cover_img,
-        )
-        for report in reports
-    ]
-
-    return {"data": report_list}
+    return json_response(
+        LatestReportPage,
+        {"data": reports, "next_cursor": next_cursor(reports, per_page)},
+    )
 
 
-@router.get("/search")
+@router.get("/search", response_model=ReportPage)
 async def get_searched_reports(
-    page: int,
     per_page: int,
     keyword: str,
+    page: int = 1,
     category_id: Optional[int] = None,  # Make category_id optional
-    db: Session = Depends(get_db),
+    after_created_date: Optional[CursorDate] = None,
+    after_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db),
 ):
-    offset = (page - 1) * per_page
-
-    query = (
-        # db.query(Report)
-        db.query(Report)
+    pattern = f"%{keyword}%"
+    stmt = lambda_stmt(
+        lambda: select(*REPORT_LIST_COLUMNS)
         .join(Category, Category.id == Report.category_id)
-        .with_entities(
-            Report.id,
-            Report.url,
-            Report.category_id,
-            Category.name.label("category_name"),
-            Category.url.label("category_url"),
-            Report.summary,
-            Report.title,
-            Report.pages,
-            Report.cover_img,
-            Report.created_date,
-        )
-        .filter(
+        .where(
             # func.to_tsvector("english", Report.title).match(
             #     keyword, postgresql_regconfig="english"
             # )
             or_(
-                func.to_tsvector("english", Report.title).match(
-                    keyword, postgresql_regconfig="english"
-                ),
-                Report.title.ilike(f"%{keyword}%"),
+                Report.title_tsv.op("@@")(func.plainto_tsquery("english", keyword)),
+                Report.title.ilike(pattern),
             )
         )
-        # .order_by(func.cast(Report.created_date, DateTime).desc())
-        # .offset(offset)
-        # .limit(per_page)
     )
-    
-     # Apply category filter if category_id is provided
+
+    # Apply category filter if category_id is provided
     if category_id is not None:
-        query = query.filter(Report.category_id == category_id)
-
-
-    reports = query.order_by(func.cast(Report.created_date, DateTime).desc()).offset(offset).limit(per_page).all()
-
-    report_list = [
-        GetReport(
-            id=report.id,
-            url=report.url,
-            title=report.title,
-            category_id=report.category_id,
-            category_name=report.category_name,
-            category_url=report.category_url,
-            summary=report.summary,
-            pages=report.pages,
-            cover_img=report.cover_img,
-            created_date=report.created_date,
-        )
-        for report in reports
-    ]
+        stmt += lambda s: s.where(Report.category_id == category_id)
 
-    return {"data": report_list}
+    stmt = paginate_by_created_date(
+        stmt, Report, page, per_page, after_created_date, after_id
+    )
+    reports = (await db.execute(stmt)).all()
+
+    return json_response(
+        ReportPage, {"data": reports, "next_cursor": next_cursor(reports, per_page)}
+    )
 
 
 @router.get("/{report_id}")
-async def get_report_by_id(report_id: int, db: Session = Depends(get_db)):
-    report = db.query(Report).filter(Report.id == report_id).first()
-    return {"data": report}
+async def get_report_by_id(report_id: int, db: AsyncSession = Depends(get_async_db)):
+    stmt = select(Report).options(raiseload("*")).where(Report.id == report_id)
+    report = (await db.execute(stmt)).scalar_one_or_none()
+    if report is None:
+        return {"data": None}
+    return {"data": GetReportDetail.model_validate(report)}
+
+
+async def load_report(db: AsyncSession, report_id: int, report_model, *options):
+    stmt = (
+        select(Report)
+        .options(joinedload(Report.category, innerjoin=True), *options)
+        .where(Report.id == report_id)
+    )
+    report = (await db.execute(stmt)).scalar_one_or_none()
+    if report is None:
+        raise HTTPException(status_code=404, detail="Report not found")
+    priceList = await get_price_list(db)
+    images = (
+        await db.execute(
+            select(ReportImage).where(ReportImage.report_id == report_id)
+        )
+    ).scalars().all()
+    return {"data":{"report": report_model.model_validate(report), "category":report.category, "price_list":priceList, "images": images}}
 
 
 @router.get("/report_load/{report_id}")
-async def get_report_by_report_id(report_id: int, db: Session = Depends(get_db)):
-    report = db.query(Report).join(Category, Category.id == Report.category_id).filter(Report.id == report_id).first()
-    category = db.query(Category).filter(Category.id == report.category_id).first()
-    priceList = db.query(Price).all()
-    images = db.query(ReportImage).filter(ReportImage.img_name.like(f"%RP{report_id}%")).all()
-    return {"data":{"report": report, "category":category, "price_list":priceList, "images": images}}
+async def get_report_by_report_id(
+    report_id: int, db: AsyncSession = Depends(get_async_db)
+):
+    return await load_report(db, report_id, GetReportDetail)
 
 
-@router.get("/url/{report_url}")
-async def get_report_by_url(report_url: str, db: Session = Depends(get_db)):
-    report = (
-        db.query(Report)
-        .join(Category, Category.id == Report.category_id)
-        .with_entities(
+@router.get("/report_load/view/{report_id}")
+async def get_report_view_by_report_id(
+    report_id: int, db: AsyncSession = Depends(get_async_db)
+):
+    # Same as report_load without the large text columns (description, toc,
+    # highlights, faqs), for pages that only show the report's summary.
+    return await load_report(
+        db,
+        report_id,
+        GetReportView,
+        load_only(
+            Report.id,
+            Report.title,
+            Report.url,
+            Report.category_id,
+            Report.summary,
+            Report.pages,
+            Report.cover_img,
+            Report.created_date,
+            raiseload=True,
+        ),
+    )
+
+
+@router.get("/url/{report_url}", response_model=ReportByUrlResponse)
+@cached(REPORT_URL_CACHE_KEY, ttl=600, response_model=ReportByUrlResponse)
+async def get_report_by_url(
+    report_url: str, db: AsyncSession = Depends(get_async_db)
+):
+    stmt = lambda_stmt(
+        lambda: select(
             Report.id,
             Report.url,
             Report.category_id,
@@ -352,196 +446,222 @@ async def get_report_by_url(report_url: str, db: Session = Depends(get_db)):
             Report.meta_desc,
             Report.meta_keyword,
         )
-        .filter(Report.url == report_url)
-        .first()
-    )
-
-    get_report_data = GetReportByUrl(
-        id=report.id,
-        url=report.url,
-        title=report.title,
-        category_id=report.category_id,
-        category_name=report.category_name,
-        category_url=report.category_url,
-        category_abr=report.category_abr,
-        summary=report.summary,
-        pages=report.pages,
-        cover_img=report.cover_img,
-        created_date=report.created_date,
-        description=report.description,
-        toc=report.toc,
-        highlights=report.highlights,
-        faqs=report.faqs,
-        meta_title=report.meta_title,
-        meta_desc=report.meta_desc,
-        meta_keyword=report.meta_keyword,
+        .join(Category, Category.id == Report.category_id)
+        .where(Report.url == report_url)
     )
+    report = (await db.execute(stmt)).first()
+    if report is None:
+        raise HTTPException(status_code=404, detail="Report not found")
 
-    return {"data": get_report_data}
+    return {"data": report}
 
-@router.get("/meta/{report_url}")
-async def get_reportmeta_by_url(report_url: str, db: Session = Depends(get_db)):
-    report = (
-        db.query(Report)
-        .with_entities(
+@router.get("/meta/{report_url}", response_model=ReportMetaDataResponse)
+@cached(REPORT_META_CACHE_KEY, ttl=600, response_model=ReportMetaDataResponse)
+async def get_reportmeta_by_url(
+    report_url: str, db: AsyncSession = Depends(get_async_db)
+):
+    stmt = lambda_stmt(
+        lambda: select(
             Report.url,
             Report.meta_title,
             Report.meta_desc,
             Report.meta_keyword,
             Report.summary,
-        )
-        .filter(Report.url == report_url)
-        .first()
-    )
-
-    get_report_data = GetReportMetaData(
-        url=report.url,
-        meta_title=report.meta_title,
-        meta_desc=report.meta_desc,
-        meta_keyword=report.meta_keyword,
-        summary=report.summary,
+        ).where(Report.url == report_url)
     )
+    report = (await db.execute(stmt)).first()
+    if report is None:
+        raise HTTPException(status_code=404, detail="Report not found")
 
-    return {"data": get_report_data}
+    return {"data": report}
 
 
-@router.get("/category/{category_url}")
+@router.get("/category/{category_url}", response_model=ReportPage)
+@cached(REPORT_CATEGORY_PAGE_CACHE_KEY, ttl=300, response_model=ReportPage)
 async def get_reports_by_category(
     category_url: str,
-    page: int,
     per_page: int,
-    db: Session = Depends(get_db),
+    page: int = 1,
+    after_created_date: Optional[CursorDate] = None,
+    after_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db),
 ):
     if category_url is None:
         raise HTTPException(status_code=404, detail="Category not found")
 
-    offset = (page - 1) * per_page
-    
-    if(category_url != 'all-industries'):
-        reports = (
-            # db.query(Report)
-            db.query(Report)
-            .join(Category, Report.category_id == Category.id)
-            .with_entities(
-                Report.id,
-                Report.url,
-                Report.category_id,
-                Category.name.label("category_name"),
-                Category.url.label("category_url"),
-                Report.summary,
-                Report.title,
-                Report.pages,
-                Report.cover_img,
-                Report.created_date,
-            )
-            .filter(Category.url == category_url)
-            .order_by(func.cast(Report.created_date, DateTime).desc())
-            .offset(offset)
-            .limit(per_page)
-            .all()
-        )
-    else:
-        reports = (
-            # db.query(Report)
-            db.query(Report)
-            .join(Category, Report.category_id == Category.id)
-            .with_entities(
-                Report.id,
-                Report.url,
-                Report.category_id,
-                Category.name.label("category_name"),
-                Category.url.label("category_url"),
-                Report.summary,
-                Report.title,
-                Report.pages,
-                Report.cover_img,
-                Report.created_date,
-            )
-            .order_by(func.cast(Report.created_date, DateTime).desc())
-            .offset(offset)
-            .limit(per_page)
-            .all()
+    stmt = lambda_stmt(
+        lambda: select(*REPORT_LIST_COLUMNS).join(
+            Category, Report.category_id == Category.id
         )
+    )
+    if category_url != "all-industries":
+        stmt += lambda s: s.where(Category.url == category_url)
+    stmt = paginate_by_created_date(
+        stmt, Report, page, per_page, after_created_date, after_id
+    )
+    reports = (await db.execute(stmt)).all()
+
+    return {"data": reports, "next_cursor": next_cursor(reports, per_page)}
 
-    report_list = [
-        GetReport(
-            id=report.id,
-            url=report.url,
-            title=report.title,
-            category_id=report.category_id,
-            category_name=report.category_name,
-            category_url=report.category_url,
-            summary=report.summary,
-            pages=report.pages,
-            cover_img=report.cover_img,
-            created_date=report.created_date,
-        )
-        for report in reports
-    ]
 
-    return {"data": report_list}
+def report_image_rows(report_id, images):
+    # Image names are sent with an "XXX" placeholder for the new report's id.
+    return [
+        {
+            **image.dict(),
+            "img_name": image.img_name.replace("XXX", str(report_id)),
+            "report_id": report_id,
+        }
+        for image in images
+    ]
 
 
 @router.post("/")
-async def create_report(report: CreateReportWithImages, db: Session = Depends(get_db)):
-    db_report = Report(**report.report.dict())
-    db.add(db_report)
-    db.commit()
-    db.refresh(db_report)
-
-    for image in report.images:
-        image.img_name = image.img_name.replace("XXX", str(db_report.id))
-        new_image = ReportImage(**image.dict())
-        db.add(new_image)
-        db.commit()
-        db.refresh(new_image)
+async def create_report(
+    report: CreateReportWithImages, db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        report_id = (
+            await db.execute(
+                insert(Report).values(**report.report.dict()).returning(Report.id)
+            )
+        ).scalar_one()
+        image_rows = report_image_rows(report_id, report.images)
+        if image_rows:
+            await db.execute(insert(ReportImage), image_rows)
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=400, detail=integrity_error_detail("Report not saved", e)
+        )
 
+    await invalidate_reports(report.report.url)
     return {"data": "Report Added Successfully"}
 
 @router.post("/bulk")
-async def bulk_create_report(reports: list[CreateReportWithImages], db: Session = Depends(get_db)):
-    for report in reports:
-        db_report = Report(**report.report.dict())
-        db.add(db_report)
-        db.commit()
-        db.refresh(db_report)
-
-        for image in report.images:
-            image.img_name = image.img_name.replace("XXX", str(db_report.id))
-            new_image = ReportImage(**image.dict())
-            db.add(new_image)
-            db.commit()
-            db.refresh(new_image)
+async def bulk_create_report(
+    reports: list[CreateReportWithImages], db: AsyncSession = Depends(get_async_db)
+):
+    stmt = insert(Report).returning(Report.id, sort_by_parameter_order=True)
+    report_ids = []
+    try:
+        for chunk in chunked(report.report.dict() for report in reports):
+            report_ids.extend((await db.execute(stmt, chunk)).scalars().all())
+
+        image_rows = (
+            row
+            for report_id, report in zip(report_ids, reports)
+            for row in report_image_rows(report_id, report.images)
+        )
+        for chunk in chunked(image_rows):
+            await db.execute(insert(ReportImage), chunk)
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail=integrity_error_detail(
+                f"Bulk insert failed after {len(report_ids)} reports, "
+                "none were saved",
+                e,
+            ),
+        )
 
+    await invalidate_reports(*(report.report.url for report in reports))
     return {"data": "Report Added Successfully"}
 
 @router.put("/{report_id}")
-async def update_report(new_report: UpdateReport, db: Session = Depends(get_db)):
-    existing_report = db.query(Report).filter(Report.id == new_report.id).first()
+async def update_report(
+    new_report: UpdateReport, db: AsyncSession = Depends(get_async_db)
+):
+    existing_report = (
+        await db.execute(
+            select(Report).options(raiseload("*")).where(Report.id == new_report.id)
+        )
+    ).scalar_one_or_none()
     if existing_report is None:
         raise HTTPException(status_code=404, detail="Report not found")
+    previous_url = existing_report.url
 
     for attr, value in new_report.dict().items():
         setattr(existing_report, attr, value)
 
-    db.commit()
-    db.refresh(existing_report)
+    await db.commit()
+    await invalidate_reports(previous_url, existing_report.url)
 
-    return {"data": existing_report}
+    return {"data": GetReportDetail.model_validate(existing_report)}
 
 
 @router.delete("/{report_id}")
-async def delete_report(report_id: int, db: Session = Depends(get_db)):
-    report = db.query(Report).filter(Report.id == report_id).first()
+async def delete_report(report_id: int, db: AsyncSession = Depends(get_async_db)):
+    report = (
+        await db.execute(
+            select(Report).options(raiseload("*")).where(Report.id == report_id)
+        )
+    ).scalar_one_or_none()
     if report is None:
         raise HTTPException(status_code=404, detail="Report not found")
 
-    db.delete(report)
-    db.commit()
+    await db.delete(report)
+    await db.commit()
+    await invalidate_reports(report.url)
     return {"message": "Report deleted"}
 
+def excel_to_payload(source, category_id_by_name):
+    data = pd.read_excel(source, sheet_name=None)
+
+    # For Multiple Sheets
+    # json_data = {}
+    # for sheet_name, sheet_data in data.items():
+    #     json_data[sheet_name] = json.loads(sheet_data.to_json(orient="records"))
+
+    # For Single Sheet
+    json_data = []
+    payload:list[CreateReportWithImages] = []
+    for sheet_name, sheet_data in data.items():
+        sheet_data["created_date"] = pd.to_datetime(
+            sheet_data["created_date"]
+        ).dt.strftime(LEGACY_DATE_FORMAT)
+        # "Global Foo Market Size ..." -> "foo-market"
+        title = sheet_data["title"].astype("string").str.lower()
+        sheet_data["url"] = (
+            (title.str.split("market", n=1, regex=False).str[0] + "market")
+            .str.replace("global ", "", regex=False)
+            .str.replace(" ", "-", regex=False)
+        )
+        first_line = (
+            sheet_data["description"].astype("string").str.split("\n", n=1).str[0]
+        )
+        for column in ("summary", "meta_desc"):
+            if column in sheet_data:
+                sheet_data[column] = first_line.combine_first(sheet_data[column])
+            else:
+                sheet_data[column] = first_line
+        sheet_data["faqs"] = ""
+        sheet_data["cover_img"] = ""
+        sheet_data["meta_keyword"] = ""
+        # Empty cells become None, as they did through to_json().
+        json_data = sheet_data.astype(object).where(sheet_data.notna(), None).to_dict(
+            orient="records"
+        )
+    for jdata in json_data:
+        report:CreateReportWithImages = {}
+        jdata['pages'] = str(jdata['pages'])
+        jdata['category_id'] = category_id_by_name.get(
+            jdata['category_id'], jdata['category_id']
+        )
+        report['report'] = jdata
+        report['images'] = []
+        payload.append(report)
+
+    return payload
+
+
 @router.post("/generate-payload-from-excel")
-async def convert_excel_to_json(file: UploadFile = File(...)):
+async def convert_excel_to_json(
+    file: UploadFile = File(...), db: AsyncSession = Depends(get_async_db)
+):
     try:
         if not file.content_type.lower() in (
             "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
@@ -549,305 +669,32 @@ async def convert_excel_to_json(file: UploadFile = File(...)):
         ):
             raise ValueError("Invalid file format. Please upload an Excel file (.xlsx or .xls).")
 
-        data = pd.read_excel(file.file, sheet_name=None) 
-        
-        category_list = [
-            {
-            "id": 6,
-            "abr": "ADV",
-            "url": "advanced-materials",
-            "back_cover": "",
-            "meta_desc": "",
-            "icon": "",
-            "name": "Advanced Material",
-            "meta_title": "",
-            "meta_keyword": ""
-            },
-            {
-            "id": 22,
-            "abr": "AGR",
-            "url": "agriculture",
-            "back_cover": None,
-            "meta_desc": None,
-            "icon": None,
-            "name": "Agriculture",
-            "meta_title": None,
-            "meta_keyword": None
-            },
-            {
-            "id": 1,
-            "abr": "ANA",
-            "url": "analytics",
-            "back_cover": "",
-            "meta_desc": "",
-            "icon": "",
-            "name": "Analytics",
-            "meta_title": "",
-            "meta_keyword": ""
-            },
-            {
-            "id": 17,
-            "abr": "ARC",
-            "url": "architecture",
-            "back_cover": "",
-            "meta_desc": "",
-            "icon": "",
-            "name": "Architecture",
-            "meta_title": "",
-            "meta_keyword": ""
-            },
-            {
-            "id": 21,
-            "abr": "AUT",
-            "url": "automobile-and-transportation",
-            "back_cover": "",
-            "meta_desc": "",
-            "icon": "",
-            "name": "Automobile & Transportation",
-            "meta_title": "",
-            "meta_keyword": ""
-            },
-            {
-            "id": 19,
-            "abr": "BIO",
-            "url": "biotechnology",
-            "back_cover": "",
-            "meta_desc": "",
-            "icon": "",
-            "name": "Biotechnology",
-            "meta_title": "",
-            "meta_keyword": ""
-            },
-            {
-            "id": 15,
-            "abr": "BLD",
-            "url": "building-materials",
-            "back_cover": "",
-            "meta_desc": "",
-            "icon": "",
-            "name": "Building Materials",
-            "meta_title": "",
-            "meta_keyword": ""
-            },
-            {
-            "id": 4,
-            "abr": "CHE",
-            "url": "chemicals",
-            "back_cover": "",
-            "meta_desc": "",
-            "icon": "",
-            "name": "Chemicals & Materials",
-            "meta_title": "",
-            "meta_keyword": ""
-            },
-            {
-            "id": 10,
-            "abr": "COM",
-            "url": "commercial-aviation",
-            "back_cover": "",
-            "meta_desc": "",
-            "icon": "",
-            "name": "Commercial Aviation",
-            "meta_title": "",
-            "meta_keyword": ""
-            },
-            {
-            "id": 12,
-            "abr": "CGS",
-            "url": "consumer-goods",
-            "back_cover": "",
-            "meta_desc": "",
-            "icon": "",
-            "name": "Consumer Goods",
-            "meta_title": "",
-            "meta_keyword": ""
-            },
-            {
-            "id": 18,
-            "abr": "CNV",
-            "url": "convenience-food",
-            "back_cover": "",
-            "meta_desc": "",
-            "icon": "",
-            "name": "Convenience Food",
-            "meta_title": "",
-            "meta_keyword": ""
-            },
-            {
-            "id": 7,
-            "abr": "EAS",
-            "url": "electronics-and-semiconductors",
-            "back_cover": "",
-            "meta_desc": "",
-            "icon": "",
-            "name": "Electronics & Semiconductors",
-            "meta_title": "",
-            "meta_keyword": ""
-            },
-            {
-            "id": 14,
-            "abr": "EAP",
-            "url": "energy-and-power",
-            "back_cover": "",
-            "meta_desc": "",
-            "icon": "",
-            "name": "Energy & Power",
-            "meta_title": "",
-            "meta_keyword": ""
-            },
-            {
-            "id": 13,
-            "abr": "FAN",
-            "url": "feed-and-animal-nutrition",
-            "back_cover": "",
-            "meta_desc": "",
-            "icon": "",
-            "name": "Feed and Animal Nutrition",
-            "meta_title": "",
-            "meta_keyword": ""
-            },
-            {
-            "id": 23,
-            "abr": "FAB",
-            "url": "food-and-beverages",
-            "back_cover": None,
-            "meta_desc": None,
-            "icon": None,
-            "name": "Food & Beverages",
-            "meta_title": None,
-            "meta_keyword": None
-            },
-            {
-            "id": 9,
-            "abr": "HAP",
-            "url": "household-appliances",
-            "back_cover": "",
-            "meta_desc": "",
-            "icon": "",
-            "name": "Household Appliances",
-            "meta_title": "",
-            "meta_keyword": ""
-            },
-            {
-            "id": 20,
-            "abr": "IEQ",
-            "url": "industrial-equipment",
-            "back_cover": "",
-            "meta_desc": "",
-            "icon": "",
-            "name": "Industrial Equipment",
-            "meta_title": "",
-            "meta_keyword": ""
-            },
-            {
-            "id": 16,
-            "abr": "IT",
-            "url": "information-technology",
-            "back_cover": "",
-            "meta_desc": "",
-            "icon": "",
-            "name": "Information Technology",
-            "meta_title": "",
-            "meta_keyword": ""
-            },
-            {
-            "id": 2,
-            "abr": "MAE",
-            "url": "machinery-and-equipment",
-            "back_cover": "",
-            "meta_desc": "",
-            "icon": "",
-            "name": "Machinery & Equipment",
-            "meta_title": "",
-            "meta_keyword": ""
-            },
-            {
-            "id": 11,
-            "abr": "MDEV",
-            "url": "medical-devices",
-            "back_cover": "",
-            "meta_desc": "",
-            "icon": "",
-            "name": "Medical Devices",
-            "meta_title": "",
-            "meta_keyword": ""
-            },
-            {
-            "id": 24,
-            "abr": "PAK",
-            "url": "packaging",
-            "back_cover": None,
-            "meta_desc": None,
-            "icon": None,
-            "name": "Packaging",
-            "meta_title": None,
-            "meta_keyword": None
-            },
-            {
-            "id": 3,
-            "abr": "PHA",
-            "url": "pharmaceuticals",
-            "back_cover": "",
-            "meta_desc": "",
-            "icon": "",
-            "name": "Pharma & Healthcare",
-            "meta_title": "",
-            "meta_keyword": ""
-            },
-            {
-            "id": 5,
-            "abr": "SER",
-            "url": "services",
-            "back_cover": "",
-            "meta_desc": "",
-            "icon": "",
-            "name": "Services",
-            "meta_title": "",
-            "meta_keyword": ""
-            }
-        ]
-        
-        # For Multiple Sheets
-        # json_data = {}
-        # for sheet_name, sheet_data in data.items():
-        #     json_data[sheet_name] = json.loads(sheet_data.to_json(orient="records"))
-        
-        # For Single Sheet
-        json_data = {}
-        payload:list[CreateReportWithImages] = []
-        for sheet_name, sheet_data in data.items():
-            json_data = json.loads(sheet_data.to_json(orient="records"))
-        for i, jdata in enumerate(json_data):
-            report:CreateReportWithImages = {}
-            json_data[i]['url'] = (json_data[i]['title'].lower().split('market')[0] + 'market').replace('global ', '').split(' ')
-            json_data[i]['url'] = '-'.join(json_data[i]['url'])
-            json_data[i]['pages'] = str(json_data[i]['pages'])
-            json_data[i]['created_date'] = datetime.fromtimestamp(json_data[i]['created_date'] / 1000.0).strftime("%Y/%m/%d")
-            if jdata['description'] is not None:
-                json_data[i]['summary'] = jdata['description'].split('\n')[0]
-                json_data[i]['meta_desc'] = jdata['description'].split('\n')[0]
-            for j, cat in enumerate(category_list):
-                if json_data[i]['category_id'] == cat['name']: 
-                    json_data[i]['category_id'] = cat['id']
-            json_data[i]['faqs'] = ''
-            json_data[i]['cover_img'] = ''
-            json_data[i]['meta_keyword'] = ''
-            report['report'] = json_data[i]
-            report['images'] = []
-            payload.append(report)
-        
-        return payload
+        category_id_by_name = await get_category_ids_by_name(db)
+        # Parsing the workbook is CPU-bound; keep it off the event loop, and
+        # don't hold a pooled connection while it runs.
+        await db.close()
+        return await run_in_threadpool(excel_to_payload, file.file, category_id_by_name)
 
     except ValueError as e:
         return {"error": str(e)}  # Handle file format errors
 
     except Exception as e:
-        error_dict = {"error": str(e)}
-        return json.dumps(error_dict)
+        return {"error": str(e)}
+
+
+def resize_and_save(source, file_path, max_width=800):
+    image = Image.open(source)
+    # For JPEGs, let libjpeg decode at the smallest scale that still covers
+    # the target size instead of decoding the full image and shrinking it.
+    image.draft(image.mode, (max_width, max_width))
+    image.thumbnail((max_width, max_width), Image.Resampling.LANCZOS)
+    # The format still follows the file extension; formats without a quality
+    # or progressive setting (e.g. PNG) ignore them.
+    image.save(file_path, quality=82, optimize=True, progressive=True)
 
 
 @router.post("/upload")
-def upload(file: UploadFile = File(...)):
+async def upload(file: UploadFile = File(...)):
     try:
         timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
 
@@ -856,16 +703,14 @@ def upload(file: UploadFile = File(...)):
         destination_folder = "images"
         os.makedirs(destination_folder, exist_ok=True)
 
-        file_path = os.path.join(destination_folder, f"{timestamp}.{file_extension}")
-
-        contents = file.file.read()
-
-        image = Image.open(io.BytesIO(contents))
-
-        max_width = 800
-        image.thumbnail((max_width, max_width))
+        # Served as immutable, so two uploads in the same second must not
+        # share a name.
+        file_name = f"{timestamp}-{uuid.uuid4().hex[:8]}.{file_extension}"
+        file_path = os.path.join(destination_folder, file_name)
 
-        image.save(file_path)
+        # UploadFile already spools large bodies to a temporary file, so decode
+        # from it directly, and keep the CPU-bound resize off the event loop.
+        await run_in_threadpool(resize_and_save, file.file, file_path)
 
     except Exception:
         return {"message": "There was an error uploading the file"}
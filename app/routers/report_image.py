@@ -1,10 +1,12 @@
 from typing import List
 from fastapi import Depends, APIRouter, HTTPException, File, UploadFile
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models import Report, ReportImage  # Import the ReportImage model
-from app.database import get_db
+from app.database import get_async_db
 from pydantic import BaseModel
 import os
+import re
 
 router = APIRouter()
 
@@ -23,37 +25,60 @@ class UpdateReportImageRequest(BaseModel):
     img_file: str
 
 
+def report_id_from_image_name(img_name: str):
+    """Image names embed their report's id as "RP<id>". Returns a subquery
+    that is NULL when no such report exists, as the migration's backfill."""
+    match = re.search(r"RP(\d+)", img_name)
+    if match is None:
+        return None
+    return select(Report.id).where(Report.id == int(match.group(1))).scalar_subquery()
+
+
 @router.post("/")
-async def create_report_image(image: CreateReportImageRequest, db: Session = Depends(get_db)):
-    existing_image = db.query(ReportImage).filter(ReportImage.img_name == image.img_name).first()
-    
+async def create_report_image(
+    image: CreateReportImageRequest, db: AsyncSession = Depends(get_async_db)
+):
+    stmt = select(ReportImage).where(ReportImage.img_name == image.img_name)
+    existing_image = (await db.execute(stmt)).scalars().first()
+
     if existing_image is None:
-        new_image = ReportImage(**image.dict())
-        db.add(new_image)
-        db.commit()
-        db.refresh(new_image)
+        await db.execute(
+            insert(ReportImage).values(
+                **image.dict(), report_id=report_id_from_image_name(image.img_name)
+            )
+        )
     else:
         existing_image.img_name = image.img_name
         existing_image.img_file = image.img_file
-        db.commit()
-        db.refresh(existing_image)
-    
+        existing_image.report_id = report_id_from_image_name(image.img_name)
+    await db.commit()
+    if existing_image is not None:
+        # report_id was set from a subquery, so its value is only known to
+        # the database.
+        await db.refresh(existing_image)
+
     return {"data": existing_image}
 
 
 
 @router.get("/{image_name}")
-async def get_images_by_search(image_name: str, db: Session = Depends(get_db)):
-    images = db.query(ReportImage).filter(ReportImage.img_name.like(f"%{image_name}%")).all()
+async def get_images_by_search(
+    image_name: str, db: AsyncSession = Depends(get_async_db)
+):
+    stmt = select(ReportImage).where(ReportImage.img_name.like(f"%{image_name}%"))
+    images = (await db.execute(stmt)).scalars().all()
     return {"data": images}
 
 
 @router.delete("/{image_id}")
-async def delete_report_image(image_id: int, db: Session = Depends(get_db)):
-    image = db.query(ReportImage).filter(ReportImage.id == image_id).first()
+async def delete_report_image(
+    image_id: int, db: AsyncSession = Depends(get_async_db)
+):
+    stmt = select(ReportImage).where(ReportImage.id == image_id)
+    image = (await db.execute(stmt)).scalar_one_or_none()
     if image is None:
         raise HTTPException(status_code=404, detail="Report Image not found")
 
-    db.delete(image)
-    db.commit()
+    await db.delete(image)
+    await db.commit()
     return {"message": "Report Image deleted"}
@@ -0,0 +1,9 @@
+from itertools import islice
+
+BULK_INSERT_CHUNK_SIZE = 1000
+
+
+def chunked(rows, size=BULK_INSERT_CHUNK_SIZE):
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
@@ -0,0 +1,171 @@
+from functools import wraps
+import os
+
+import orjson
+import requests
+from fastapi import HTTPException, Response
+from fastapi.encoders import jsonable_encoder
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+from app.utils.response import render as render_model
+
+REDIS_URL = os.environ.get("REDIS_URL")
+CDN_PURGE_URL = os.environ.get("CDN_PURGE_URL")
+
+# Near-static catalog responses: shared caches may serve them for a minute
+# and keep serving them for five more while they revalidate in the background.
+CATALOG_CACHE_CONTROL = "public, max-age=60, stale-while-revalidate=300"
+# Files that are written once under a unique name, like uploaded images.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+redis_client = None
+
+# Cached 404s are stored as this prefix followed by the error detail; real
+# payloads are JSON and can never start with a NUL byte.
+NOT_FOUND_MARKER = b"\x00404:"
+
+
+async def init_cache():
+    global redis_client
+    if REDIS_URL:
+        redis_client = aioredis.from_url(
+            REDIS_URL, socket_connect_timeout=1, socket_timeout=1
+        )
+
+
+async def close_cache():
+    if redis_client is not None:
+        await redis_client.close()
+
+
+async def _read(cache_key):
+    """Return the cached (content, etag) pair; both are None on a miss."""
+    try:
+        return await redis_client.hmget(cache_key, "content", "etag")
+    except RedisError:
+        return None, None
+
+
+async def _write(cache_key, ttl, content, etag=None):
+    mapping = {"content": content}
+    if etag is not None:
+        mapping["etag"] = etag
+    try:
+        async with redis_client.pipeline(transaction=True) as pipe:
+            await pipe.hset(cache_key, mapping=mapping).expire(cache_key, ttl).execute()
+    except RedisError:
+        pass
+
+
+def _response(content, etag=None, request=None, cache_control=None):
+    headers = {}
+    if cache_control is not None:
+        headers["Cache-Control"] = cache_control
+    if etag is not None:
+        headers["ETag"] = etag
+        if_none_match = request.headers.get("if-none-match") if request else None
+        if if_none_match and etag in (t.strip() for t in if_none_match.split(",")):
+            return Response(status_code=304, headers=headers)
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+def cached(
+    key: str,
+    ttl: int = 300,
+    response_model=None,
+    not_found_ttl: int = 30,
+    etag=None,
+    cache_control=None,
+):
+    """Serve the endpoint's JSON from Redis, keyed on `key` formatted with the
+    route params. Falls through to the endpoint when Redis is not configured
+    or unreachable.
+
+    Pass the route's `response_model` so cache misses are serialized the same
+    way FastAPI would serialize them. 404s raised by the endpoint are cached
+    for `not_found_ttl` seconds so repeated lookups of missing rows skip the
+    database.
+
+    `etag` is called with the endpoint's result and returns the quoted ETag to
+    cache next to the body. The endpoint must then take a `request: Request`
+    param, which is used to answer a matching If-None-Match with a 304.
+
+    `cache_control` is sent as the Cache-Control header of every response
+    served through the decorator."""
+
+    def decorator(func):
+        def render(result):
+            if response_model is not None:
+                return render_model(response_model, result)
+            return orjson.dumps(jsonable_encoder(result))
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            request = kwargs.get("request")
+            if redis_client is None:
+                result = await func(*args, **kwargs)
+                result_etag = etag(result) if etag is not None else None
+                return _response(render(result), result_etag, request, cache_control)
+
+            cache_key = key.format(**kwargs)
+            content, cached_etag = await _read(cache_key)
+            if content is not None:
+                if content.startswith(NOT_FOUND_MARKER):
+                    detail = content[len(NOT_FOUND_MARKER) :].decode()
+                    raise HTTPException(status_code=404, detail=detail)
+                if cached_etag is not None:
+                    cached_etag = cached_etag.decode()
+                return _response(content, cached_etag, request, cache_control)
+
+            try:
+                result = await func(*args, **kwargs)
+            except HTTPException as e:
+                if e.status_code == 404:
+                    await _write(
+                        cache_key,
+                        not_found_ttl,
+                        NOT_FOUND_MARKER + str(e.detail).encode(),
+                    )
+                raise
+            content = render(result)
+            result_etag = etag(result) if etag is not None else None
+            await _write(cache_key, ttl, content, result_etag)
+            return _response(content, result_etag, request, cache_control)
+
+        return wrapper
+
+    return decorator
+
+
+async def invalidate(*keys: str):
+    if redis_client is None or not keys:
+        return
+    try:
+        await redis_client.delete(*keys)
+    except RedisError:
+        pass
+
+
+async def invalidate_matching(pattern: str):
+    """Delete every key matching the glob `pattern`, for endpoints cached
+    once per page or query string."""
+    if redis_client is None:
+        return
+    try:
+        keys = [key async for key in redis_client.scan_iter(match=pattern, count=500)]
+        if keys:
+            await redis_client.delete(*keys)
+    except RedisError:
+        pass
+
+
+def purge_cdn(*paths: str):
+    """Ask the CDN to drop `paths` before their max-age runs out. Runs as a
+    background task and does nothing unless CDN_PURGE_URL is set."""
+    if not CDN_PURGE_URL or not paths:
+        return
+    try:
+        requests.post(CDN_PURGE_URL, json={"paths": list(paths)}, timeout=5)
+    except requests.RequestException:
+        pass
@@ -0,0 +1,32 @@
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipResponder
+
+# JPEG images and xlsx exports are compressed formats already; gzipping them
+# again costs CPU and saves nothing.
+COMPRESSIBLE_CONTENT_TYPES = ("application/json", "text/")
+
+
+class TextGZipResponder(GZipResponder):
+    async def send_with_gzip(self, message):
+        await super().send_with_gzip(message)
+        if message["type"] == "http.response.start":
+            content_type = Headers(raw=message["headers"]).get("content-type", "")
+            if not content_type.startswith(COMPRESSIBLE_CONTENT_TYPES):
+                # Pass the body through as for an already encoded response.
+                self.content_encoding_set = True
+
+
+class TextGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that only compresses JSON and text responses."""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            headers = Headers(scope=scope)
+            if "gzip" in headers.get("Accept-Encoding", ""):
+                responder = TextGZipResponder(
+                    self.app, self.minimum_size, compresslevel=self.compresslevel
+                )
+                await responder(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
@@ -0,0 +1,32 @@
+from datetime import datetime, timezone
+from typing import Annotated
+
+from pydantic import AfterValidator, BeforeValidator, PlainSerializer
+
+LEGACY_DATE_FORMAT = "%Y/%m/%d"
+
+
+def parse_legacy_date(value):
+    # The admin panel and the Excel import send dates as YYYY/MM/DD, meaning
+    # midnight UTC.
+    if isinstance(value, str) and len(value) == 10:
+        return datetime.strptime(value.replace("-", "/"), LEGACY_DATE_FORMAT).replace(
+            tzinfo=timezone.utc
+        )
+    return value
+
+
+def assume_utc(value):
+    # asyncpg writes a naive datetime to a timestamptz column in the host's
+    # time zone, so give it UTC before it gets there.
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+CreatedDate = Annotated[
+    datetime,
+    BeforeValidator(parse_legacy_date),
+    AfterValidator(assume_utc),
+    PlainSerializer(lambda value: value.strftime(LEGACY_DATE_FORMAT), when_used="json"),
+]
@@ -0,0 +1,12 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def integrity_error_detail(message, error):
+    """Log the IntegrityError `error` and return `message` for the client,
+    followed by the database's DETAIL line (e.g. "Key (url)=(x) already
+    exists.") when there is one. The driver's own text stays in the log."""
+    logger.warning("%s: %s", message, error.orig)
+    detail = getattr(error.orig.__cause__, "detail", None)
+    return f"{message}: {detail}" if detail else message
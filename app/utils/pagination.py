@@ -0,0 +1,67 @@
+from datetime import datetime
+from typing import Annotated, Optional
+
+from pydantic import AfterValidator, BaseModel
+from sqlalchemy import func, literal_column, tuple_
+
+from app.utils.dates import assume_utc
+
+# Sort value for rows without a created_date (legacy '' dates), so that
+# `created_date_sort_key(...) DESC` lists them after every dated row. It is
+# spelled out as SQL, not bound, so the queries match the expression indexes
+# on report and press_release.
+UNDATED = literal_column("'-infinity'::timestamptz")
+
+# A cursor date sent without an offset is UTC, like the created dates it is
+# compared with; asyncpg would otherwise bind it in the host's time zone.
+CursorDate = Annotated[datetime, AfterValidator(assume_utc)]
+
+
+class CreatedDateCursor(BaseModel):
+    # None when the previous page ended among the undated rows; clients then
+    # send after_id alone.
+    after_created_date: Optional[CursorDate]
+    after_id: int
+
+
+def created_date_sort_key(model):
+    # created_date DESC NULLS LAST as a single value, so a cursor is one
+    # index range whether or not it starts among the undated rows.
+    return func.coalesce(model.created_date, UNDATED)
+
+
+def paginate_by_created_date(
+    stmt, model, page, per_page, after_created_date, after_id
+):
+    # Newest `model` rows first. Seek past the previous page's last
+    # (created_date, id) when the client sends it; page numbers still work
+    # for clients that don't. `stmt` is a lambda_stmt, so each step is a
+    # lambda whose SQL is compiled once and whose closure values are bound
+    # per request.
+    stmt += lambda s: s.order_by(
+        created_date_sort_key(model).desc(), model.id.desc()
+    ).limit(per_page)
+    if after_id is not None and after_created_date is not None:
+        stmt += lambda s: s.where(
+            tuple_(created_date_sort_key(model), model.id)
+            < tuple_(after_created_date, after_id)
+        )
+        return stmt
+    if after_id is not None:
+        stmt += lambda s: s.where(
+            tuple_(created_date_sort_key(model), model.id)
+            < tuple_(UNDATED, after_id)
+        )
+        return stmt
+    offset = (page - 1) * per_page
+    stmt += lambda s: s.offset(offset)
+    return stmt
+
+
+def next_cursor(rows, per_page):
+    # Cursor for the page after `rows`, which are ordered by
+    # paginate_by_created_date; None once the last page is reached.
+    if len(rows) < per_page:
+        return None
+    last = rows[-1]
+    return {"after_created_date": last.created_date, "after_id": last.id}
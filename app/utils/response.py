@@ -0,0 +1,30 @@
+from functools import lru_cache
+from typing import Generic, TypeVar
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+T = TypeVar("T")
+
+
+class DataResponse(BaseModel, Generic[T]):
+    data: T
+
+
+@lru_cache(maxsize=None)
+def _adapter(response_model):
+    return TypeAdapter(response_model)
+
+
+def render(response_model, content) -> bytes:
+    """Validate `content` (dicts, rows or ORM objects) against
+    `response_model` and dump it straight to JSON bytes, skipping FastAPI's
+    intermediate jsonable dict."""
+    adapter = _adapter(response_model)
+    return adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+
+
+def json_response(response_model, content) -> Response:
+    return Response(
+        content=render(response_model, content), media_type="application/json"
+    )
@@ -0,0 +1,13 @@
+from fastapi.staticfiles import StaticFiles
+
+from app.utils.cache import IMMUTABLE_CACHE_CONTROL
+
+
+class ImmutableStaticFiles(StaticFiles):
+    """StaticFiles for directories whose files are never rewritten, so browsers
+    and the CDN can keep them instead of coming back to the app server."""
+
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        return response